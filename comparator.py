@@ -14,8 +14,9 @@ from importlib_metadata import abc
 #         "variables": {
 #             "var_name": {
 #                 "value": [ 1, 2, 3 ],
-#                 "type": "int" | "float" | "str" | "*",
+#                 "type": "int" | "float" | "date" | "str" | "*",
 #                 "length": -1 | <LENGTH>,
+#                 "enum": [ 1, 2 ],  (optional)
 #                 "required": true | false,
 #                 "error": 0 | 1,
 #                 "message": <RESULT>
@@ -133,7 +134,7 @@ class Comparator():
     
 
                 _type = pages[page][Comparator.keyword][variable]["type"]
-                if _type != "int" and _type != "float" and _type != "str" and _type != "*":
+                if _type != "int" and _type != "float" and _type != "date" and _type != "str" and _type != "*":
                     raise error("[FormatCheck] Value for type in variable '" + str(variable) + "' in page '" + str(page) + "' is not invalid. " + str(_type))
     
 
@@ -219,8 +220,10 @@ class Comparator():
                     continue
 
                 # check if the variable type is defined and matches
+                # a date is a string too, so original states read before dates
+                # were detected still accept dates
                 if original_variable_def["type"] != "*":
-                    if original_variable_def["type"] != tested_variable["type"]:
+                    if original_variable_def["type"] != tested_variable["type"] and not (original_variable_def["type"] == "str" and tested_variable["type"] == "date"):
                         self.failed += 1
                         tested_variable_result["message"] = "Test failed. The type of the variable does not match the expected type."
                         tested_variable_result["error"] = 1
@@ -252,6 +255,16 @@ class Comparator():
                         tested_variable_result["error"] = 1
                         continue
 
+                # check if tested value is one of the values seen for this variable on all pages
+                if "enum" in original_variable_def and len(original_variable_def["enum"]) > 0:
+
+                    if tested_variable["value"][0] not in original_variable_def["enum"]:
+
+                        self.failed += 1
+                        tested_variable_result["message"] = "Test failed. The value of the variable is not included in the list of enum values."
+                        tested_variable_result["error"] = 1
+                        continue
+
                 self.succeed += 1
                 tested_variable_result["message"] = "Test was successful."
                 tested_variable_result["error"] = 0
@@ -5,10 +5,13 @@ import time
 import sys, urllib3, os
 # from selenium import webdriver
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from seleniumwire import webdriver  # wrapper to get network requests from browser and also modify LaunchRequests in real time (https://stackoverflow.com/questions/31354352/selenium-how-to-inject-execute-a-javascript-in-to-a-page-before-loading-executi)
-import pickle # to save / load cookies
+import pickle # to save / load cookies and recorded responses
+import hashlib # name recorded responses in the archive
+import tempfile # write recorded responses atomically
 from pathlib import Path # check if cookie dump exists
-from urllib.parse import urlparse, parse_qs, urldefrag # extract get parameters from url
+from urllib.parse import urlparse, parse_qs, parse_qsl, urldefrag, urlencode # extract get parameters from url
 import json # export result
 
 # modify requests before rendering of page https://stackoverflow.com/questions/31354352/selenium-how-to-inject-execute-a-javascript-in-to-a-page-before-loading-executi
@@ -18,6 +21,10 @@ from lxml.html import builder
 
 import argparse
 
+import urllib.request # post monitor events to a webhook
+
+import re
+
 import pandas as pd
 
 from comparator import Comparator
@@ -27,29 +34,81 @@ from os import get_terminal_size
 
 from datetime import datetime
 
-def get_real_type(string: str) -> str:
+# patterns to classify captured values, see get_real_types
+# like int() and float(), single underscores between digits are allowed
+DIGITS = r'\d(_?\d)*'
+INT_PATTERN = r'\s*[+-]?' + DIGITS + r'\s*'
+FLOAT_PATTERN = r'\s*[+-]?(' + DIGITS + r'(\.(' + DIGITS + r')?)?|\.' + DIGITS + r')(e[+-]?' + DIGITS + r')?\s*|\s*[+-]?(inf|infinity|nan)\s*'
+# ISO dates (2021-01-17, 2021-01-17T10:11:12+01:00), german dates (17.01.2021)
+# and the Adobe Analytics timestamp with zero based month, weekday and offset in minutes (17/0/2021 10:11:12 0 -60)
+DAY = r'(0?[1-9]|[12]\d|3[01])'
+MONTH = r'(0?[1-9]|1[0-2])'
+DATE_PATTERN = (
+    r'\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])([T ]([01]\d|2[0-3]):[0-5]\d(:[0-5]\d(\.\d+)?)?(Z|[+-]([01]\d|2[0-3]):?[0-5]\d)?)?'
+    + r'|' + DAY + r'\.' + MONTH + r'\.\d{4}'
+    + r'|' + DAY + r'/(\d|1[01])/\d{4}( ([01]?\d|2[0-3]):[0-5]?\d:[0-5]?\d [0-6] [+-]?\d{1,3})?'
+)
+
+# one pattern for all types, the first alternative that matches the whole value wins
+TYPE_PATTERN = re.compile(
+    '(?P<int>' + INT_PATTERN + ')|(?P<float>' + FLOAT_PATTERN + ')|(?P<date>' + DATE_PATTERN + ')',
+    re.IGNORECASE)
+
+# numbers and dates start with one of these, everything else is a string without trying the pattern
+TYPE_FIRST_CHARACTERS = set('0123456789+-. \t\n\r\f\viInN')
+
+# memoised types of already classified values, most tracked values repeat on every page,
+# when the cache is full, new values are classified without being cached
+type_cache = {}
+TYPE_CACHE_SIZE = 100000
+
+def classify_value(string: str) -> str:
+
+    if string[:1] not in TYPE_FIRST_CHARACTERS:
+        return 'str'
+
+    match = TYPE_PATTERN.fullmatch(string)
+
+    return match.lastgroup if match else 'str'
+
+def get_real_types(strings: list) -> list:
+    """Classify a whole list of values at once as 'int', 'float', 'date' or 'str'"""
+
+    # every distinct value of this batch is classified only once, even when the cache is full
+    types = {}
+
+    for string in dict.fromkeys(strings):
+        value_type = type_cache.get(string)
+
+        if value_type is None:
+            value_type = classify_value(string)
+            if len(type_cache) < TYPE_CACHE_SIZE:
+                type_cache[string] = value_type
 
-    # TODO: also check if string is a date
-    if is_int(string):
-        return 'int'
-    elif is_float(string):
-        return 'float'
+        types[string] = value_type
+
+    return [types[string] for string in strings]
+
+def parse_tracking_parameters(url: str, method: str = 'GET', body: str = '') -> dict:
+    """Extract the tracked variables from a single analytics request, either from the url or the POST body"""
+
+    if method == 'POST':
+        str_tracking_parameters = urlparse('https://dummy.dummy/dummy/?' + body)
     else:
-        return 'str'
+        str_tracking_parameters = urlparse(url)
 
-def is_int(string: str) -> bool:
-    try: 
-        int(string)
-        return True
-    except ValueError:
-        return False
+    return parse_qs(str_tracking_parameters.query, keep_blank_values=True)
 
-def is_float(string: str) -> bool:
-    try: 
-        float(string)
-        return True
-    except ValueError:
-        return False
+def normalise_url(url: str, keep_query: bool = True) -> str:
+    """Make page urls comparable: lowercase scheme and host, no fragment and no trailing slash"""
+
+    parsed = urlparse(url)
+    normalised = parsed.scheme.lower() + '://' + parsed.netloc.lower() + parsed.path.rstrip('/')
+
+    if keep_query and parsed.query:
+        normalised += '?' + parsed.query
+
+    return normalised
 
 class TrackTracker:
     """Compare two different states of tracked variables for a given set of webpages
@@ -60,7 +119,7 @@ class TrackTracker:
 
     env -- keyword that points to the section in the settings files to use
 
-    mode -- init: initially read the original state, test: compare original state and current state, analyse: analyse test status and create a report
+    mode -- init: initially read the original state, test: compare original state and current state, analyse: analyse test status and create a report, monitor: continuously rescan pages and report verdict changes, import: compare original state and beacons from a HAR file or beacon log
 
     original -- file that contains the original state in JSON format
     
@@ -69,6 +128,10 @@ class TrackTracker:
     silent -- set to true to enable headless mode, otherwise a browser window will open and you can "observe" the process
     
     focus -- set to a unique page name from your settings section to only scan this particular page, this will disable all file outputs to prevent unwanted loss of previous data
+
+    beacons -- HAR file or beacon log to read the current state from in import mode, no browser is used
+
+    network -- live: load pages from the web, record: load pages from the web and store the responses in the archive, replay: serve the responses from the archive, only the tag container and the analytics requests go to the web
     """
     
     sitemap = {}
@@ -82,7 +145,9 @@ class TrackTracker:
         original: str, 
         test: str,
         silent: str,
-        focus: str = None):
+        focus: str = None,
+        beacons: str = None,
+        network: str = 'live'):
 
         self.setup(settings, env, focus)
 
@@ -92,7 +157,7 @@ class TrackTracker:
 
         if mode == 'init' and focus is None:
 
-            self.init_driver(silent, mode)
+            self.init_driver(silent, mode, network)
 
             self.parse_pages(self.urls)
 
@@ -120,7 +185,7 @@ class TrackTracker:
 
         elif mode == 'test':
 
-            self.init_driver(silent, mode)
+            self.init_driver(silent, mode, network)
 
             self.parse_pages(self.urls)
 
@@ -151,6 +216,72 @@ class TrackTracker:
 
             self.shutdown()
 
+        elif mode == 'import':
+
+            self.import_beacons(beacons)
+
+            with open('results/' + original, 'r') as file:
+                self.original = json.load(file)
+
+            # check against the whole original, pages outside the focus have no hits anyway
+            unknown_pages = sorted(set(page_name for page_name in self.hit_pages.values() if page_name not in self.original))
+            if len(unknown_pages) > 0:
+                print(f'Skipped hits of {len(unknown_pages)} pages that are not part of the original: {", ".join(unknown_pages)}')
+
+            if focus is not None:
+                self.original = {focus: self.original[focus]}
+
+            missing_pages = [page_name for page_name in self.original if page_name not in self.hit_pages.values()]
+            if len(missing_pages) > 0:
+                print(f'No hits found for {len(missing_pages)} pages of the original: {", ".join(missing_pages)}')
+
+            # every hit is checked against the original of its page
+            self.original = {
+                hit: self.original[page_name]
+                for hit, page_name in self.hit_pages.items()
+                if page_name in self.original
+            }
+            self.result = {hit: self.result[hit] for hit in self.original}
+
+            if len(self.original) == 0:
+                print(f'No hits to check in {beacons}, do you provided the correct adobe_analytics_host and urls?')
+                sys.exit()
+
+            self.identify_variables()
+
+            comparator = Comparator(self.original)
+
+            self.result = comparator.check_json(self.result, self.var_mapping)
+
+            # don't create the excel output when focus page is defined
+            if focus is None:
+                with open('results/' + test, 'w') as file:
+                    json.dump(self.result, file)
+
+            self.analyse_result()
+
+            # don't create the excel output when focus page is defined
+            if focus is None:
+                self.df_results_analysed.to_excel('results/' + test + '.xlsx')
+                print(f'Wrote results to ./results/{test}.xlsx')
+
+        elif mode == 'monitor':
+
+            with open('results/' + original, 'r') as file:
+                self.original = json.load(file)
+
+            if focus is not None:
+                self.original = {focus: self.original[focus]}
+
+            self.init_driver(silent, mode, network)
+
+            try:
+                self.monitor(self.urls, silent, network)
+            except KeyboardInterrupt:
+                print('Monitoring stopped.')
+            finally:
+                self.shutdown()
+
             # loop through given webpages to read the original (desired) status of a website
 
         # elif mode == 'test':
@@ -176,6 +307,89 @@ class TrackTracker:
 
         return request
 
+    def is_live_request(self, request) -> bool:
+        """Requests to the tag container and the analytics host are never recorded or replayed"""
+
+        return request.host in (self.adobe_launch_host, self.adobe_analytics_host)
+
+    def strip_ignored_parameters(self, query: str) -> str:
+        """Remove cache busters and other parameters that change on every run, see archive_ignore_parameters"""
+
+        return urlencode([
+            (name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+            if name not in self.archive_ignore_parameters
+        ])
+
+    def get_archive_path(self, request) -> Path:
+
+        url = urlparse(request.url)
+        url = url._replace(query=self.strip_ignored_parameters(url.query)).geturl()
+
+        body = request.body or b''
+        if 'application/x-www-form-urlencoded' in (request.headers.get('Content-Type') or ''):
+            body = self.strip_ignored_parameters(body.decode('utf-8', 'replace')).encode('utf-8')
+
+        key = hashlib.sha1((request.method + ' ' + url).encode('utf-8') + body).hexdigest()
+
+        return Path(self.archive) / key
+
+    def record_response(self, request, response):
+
+        if self.is_live_request(request):
+            return
+
+        # a revalidated asset comes without body, a replay starts with an empty browser cache
+        if response.status_code == 304:
+            return
+
+        archive_path = self.get_archive_path(request)
+
+        # keep a complete response that was recorded on a previous page
+        if archive_path.exists() and not 200 <= response.status_code < 300:
+            return
+
+        # responses are recorded from several threads, so write to a temporary file first
+        # and move it into place, readers never see a half written record
+        with tempfile.NamedTemporaryFile('wb', dir=self.archive, delete=False) as file:
+            try:
+                pickle.dump({
+                    'status_code': response.status_code,
+                    'headers': list(response.headers.items()),
+                    'body': response.body
+                }, file)
+            except Exception:
+                file.close()
+                os.unlink(file.name)
+                raise
+
+        try:
+            os.replace(file.name, archive_path)
+        except Exception:
+            os.unlink(file.name)
+            raise
+
+    def replay_response(self, request):
+
+        if self.is_live_request(request):
+            return
+
+        archive_path = self.get_archive_path(request)
+
+        # requests that were not recorded are not sent to the web, this keeps replayed runs deterministic
+        if not archive_path.exists():
+            print(f'Not found in archive: {request.method} {request.url}')
+            request.abort(error_code=404)
+            return
+
+        with open(archive_path, 'rb') as file:
+            recorded = pickle.load(file)
+
+        request.create_response(
+            status_code=recorded['status_code'],
+            headers=recorded['headers'],
+            body=recorded['body']
+        )
+
 
     def analyse_result(self):
 
@@ -251,6 +465,190 @@ class TrackTracker:
         for page_name in pages:
             self.result[page_name] = self.parse_page(pages[page_name])
 
+    def monitor(self, pages, silent, network='live'):
+        """Rescan the given pages forever and emit an event whenever the verdict of a page changes.
+
+            Pages are staggered evenly over monitor_interval, so the sites are not hit all at once.
+            The browser is kept open between scans. Every page is compared to the original state
+            right after it was captured. A page that can not be scanned gets the verdict "error",
+            monitoring of the other pages continues. If the browser itself fails, it is restarted.
+
+        """
+        self.exit_on_missing_beacon = False
+
+        missing_pages = [page_name for page_name in pages if page_name not in self.original]
+        if len(missing_pages) > 0:
+            print(f'Pages are not part of the original and will not be monitored: {", ".join(missing_pages)}')
+            pages = {page_name: pages[page_name] for page_name in pages if page_name in self.original}
+
+        if len(pages) == 0:
+            print('No pages to monitor, do you provided the correct original?')
+            sys.exit()
+
+        verdicts = {}
+        stagger = self.monitor_interval / len(pages)
+        schedule = {page_name: time.time() + i * stagger for i, page_name in enumerate(pages)}
+
+        while True:
+
+            page_name = min(schedule, key=schedule.get)
+            time.sleep(max(0, schedule[page_name] - time.time()))
+            schedule[page_name] += self.monitor_interval
+
+            message = None
+
+            try:
+                self.result = {page_name: self.parse_page(pages[page_name])}
+                self.identify_variables()
+
+                comparator = Comparator({page_name: self.original[page_name]})
+                page_result = comparator.check_json(self.result, self.var_mapping)[page_name]
+
+                failed_variables = sorted(
+                    variable for variable in page_result['variables']
+                    if page_result['variables'][variable].get('error') == 1
+                )
+                verdict = {
+                    'status': 'failed' if failed_variables else 'passed',
+                    'failed_variables': failed_variables
+                }
+            except Exception as e:
+                message = f'{type(e).__name__}: {e}'
+                print(f'Could not scan {pages[page_name]}: {message}')
+                verdict = {
+                    'status': 'error',
+                    'failed_variables': []
+                }
+
+                # the browser or the driver session may be gone, start a new one for the next scan
+                if isinstance(e, WebDriverException):
+                    # quit instead of shutdown, so the old chromedriver process ends too
+                    try:
+                        self.driver.quit()
+                    except Exception:
+                        pass
+                    self.init_driver(silent, 'monitor', network)
+                    print('Restarted the browser.')
+
+            if verdicts.get(page_name) != verdict:
+                event = {
+                    'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'page': page_name,
+                    'url': pages[page_name],
+                    'previous': verdicts.get(page_name),
+                    'verdict': verdict
+                }
+                if message is not None:
+                    event['message'] = message
+                self.emit_event(event)
+                verdicts[page_name] = verdict
+
+    def emit_event(self, event):
+        """Append a monitor event to the events file and post it to the webhook, if configured"""
+
+        print(f'{event["date"]} {event["page"]}: {event["verdict"]["status"]} {", ".join(event["verdict"]["failed_variables"])}')
+
+        with open('results/' + self.monitor_events, 'a') as file:
+            file.write(json.dumps(event) + '\n')
+
+        if self.monitor_webhook is not None:
+            request = urllib.request.Request(
+                self.monitor_webhook,
+                data=json.dumps(event).encode('utf-8'),
+                headers={'Content-Type': 'application/json'})
+            try:
+                urllib.request.urlopen(request, timeout=5)
+            except Exception as e:
+                print(f'Could not post event to {self.monitor_webhook}: {e}')
+
+    def import_beacons(self, filename):
+        """Read analytics requests from a file instead of the browser. Supported formats are:
+
+            HAR files (*.har) as exported by the developer tools of the browser
+
+            beacon logs, one request per line, either as plain GET url or as JSON object:
+
+            {"url": "https://...", "method": "POST", "body": "...", "page": "https://example.com"}
+
+            Every request is assigned to the page from your settings section with the same url,
+            taken from the page key, the referer or the tracked page url (parameter g).
+            Requests of unknown pages are skipped. Every request is kept as a hit of its own,
+            the first hit of a page is named like the page, the following ones "page (2)", "page (3)", ...
+
+        """
+        beacons = []
+        self.hit_pages = {}
+
+        with open(filename, 'r') as file:
+            if filename.endswith('.har'):
+                for entry in json.load(file)['log']['entries']:
+                    request = entry['request']
+                    headers = {header['name'].lower(): header['value'] for header in request.get('headers') or []}
+                    # HAR 1.2 stores the body either as text or as list of form params
+                    post_data = request.get('postData') or {}
+                    body = post_data.get('text')
+                    if body is None and post_data.get('params'):
+                        body = urlencode([(param['name'], param.get('value', '')) for param in post_data['params']])
+                    beacons.append({
+                        'url': request['url'],
+                        'method': request['method'],
+                        'body': body or '',
+                        'page': headers.get('referer')
+                    })
+            else:
+                for line in file:
+                    line = line.strip()
+                    if line.startswith('{'):
+                        beacons.append(json.loads(line))
+                    elif line:
+                        beacons.append({'url': line})
+
+        # match with query first, the page url without query is used as fallback
+        page_names = {normalise_url(url, False): page_name for page_name, url in self.urls.items()}
+        page_names.update({normalise_url(url): page_name for page_name, url in self.urls.items()})
+
+        skipped = 0
+        hits_per_page = {}
+        # hits that only match a page after the query was dropped, e.g. a different search term
+        query_dropped = {}
+
+        for beacon in beacons:
+
+            if urlparse(beacon['url']).hostname != self.adobe_analytics_host:
+                continue
+
+            variables = parse_tracking_parameters(beacon['url'], beacon.get('method') or 'GET', beacon.get('body') or '')
+
+            page_name = None
+            for page_url in (beacon.get('page'), variables.get('g', [None])[0]):
+                if page_url:
+                    page_name = page_names.get(normalise_url(page_url), page_names.get(normalise_url(page_url, False)))
+                if page_name is not None:
+                    break
+
+            if page_name is None:
+                skipped += 1
+                continue
+
+            if normalise_url(page_url) != normalise_url(self.urls[page_name]):
+                query_dropped[page_name] = query_dropped.get(page_name, 0) + 1
+
+            hits_per_page[page_name] = hits_per_page.get(page_name, 0) + 1
+            hit = page_name if hits_per_page[page_name] == 1 else f'{page_name} ({hits_per_page[page_name]})'
+
+            self.hit_pages[hit] = page_name
+            self.result[hit] = {
+                'url': self.urls[page_name],
+                'request_url': beacon['url'],
+                'variables': variables
+            }
+
+        print(f'Imported {len(self.result)} hits for {len(hits_per_page)} of {len(self.urls)} pages from {filename}, skipped {skipped} hits of unknown pages')
+
+        if len(query_dropped) > 0:
+            print(f'{sum(query_dropped.values())} hits only match their page without the query and are checked against its original anyway: '
+                + ', '.join(f'{page_name} ({count})' for page_name, count in query_dropped.items()))
+
     def setup(self, settings, env, focus):
 
         with open(settings, 'r') as f:
@@ -274,15 +672,35 @@ class TrackTracker:
 
         self.var_mapping = settings['mapping']
 
+        # variables with at most this number of distinct values over all pages get an enum list,
+        # disabled by default because the enum is checked in addition to the value
+        self.enum_max_values = settings.get('enum_max_values', 0)
+
+        # recorded responses for record and replay of the network traffic
+        self.archive = settings.get('archive', 'archive/' + env)
+        # query parameters that change on every run, they are not part of the key of a recorded response
+        self.archive_ignore_parameters = settings.get('archive_ignore_parameters', ['_', 'cb'])
+
+        # optional settings for monitor mode
+        self.monitor_interval = settings.get('monitor_interval', 900)
+        self.monitor_events = settings.get('monitor_events', 'monitor_events.jsonl')
+        self.monitor_webhook = settings.get('monitor_webhook')
+        self.exit_on_missing_beacon = True
+
         # keep those for later use: automatically parse a whole website?
         # self.urls_parsed = [] # a plain list of all urls to parse
         # self.urls_to_parse_next = [] # a plain list of all urls to be parsed
         # self.internal_only = bool(settings['internal_only']) # parse links from same host
         # self.max_depth = settings['max_depth'] # from starting url, do not go deeper than this
 
-    def init_driver(self, silent, mode):
+    def init_driver(self, silent, mode, network='live'):
         """
         Inits the chrome browser driver"""
+
+        if network == 'replay' and not Path(self.archive).exists():
+            print(f'Could not find the archive {self.archive}, do you recorded the pages with --network=record before?')
+            sys.exit()
+
         PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
         DRIVER_BIN = os.path.join(PROJECT_ROOT, "chromedriver")
 
@@ -307,6 +725,18 @@ class TrackTracker:
         if mode != 'init':
             self.driver.request_interceptor = self.switch_tag_container
 
+        if network == 'record':
+            Path(self.archive).mkdir(parents=True, exist_ok=True)
+            self.driver.response_interceptor = self.record_response
+
+        elif network == 'replay':
+            def intercept(request):
+                if mode != 'init':
+                    self.switch_tag_container(request)
+                self.replay_response(request)
+
+            self.driver.request_interceptor = intercept
+
         # self.driver.header_overrides = {'Accept-Encoding': 'gzip'} # ensure we only get gzip encoded responses
 
     def shutdown(self):
@@ -316,23 +746,38 @@ class TrackTracker:
 
     def identify_variables(self) -> dict:
 
-        for page_name in self.result:
-
-            current_page = self.result[page_name]
-
-            for variable in current_page['variables']:
-                current_value = current_page['variables'][variable]
-                current_value_definition = {
-                    'value': current_value,
-                    'type': get_real_type(current_value[0]),
-                    'length': len(current_value[0]),
-                    'required': True
-                }
-
-                current_page['variables'][variable] = current_value_definition
+        # classify the values of all pages at once, repeated values are taken from the cache
+        variables = [
+            (page_name, variable)
+            for page_name in self.result
+            for variable in self.result[page_name]['variables']
+        ]
+        first_values = [self.result[page_name]['variables'][variable][0] for page_name, variable in variables]
+        types = get_real_types(first_values)
+
+        # collect the values of every variable over all pages to find enum-like variables
+        distinct_values = {}
+        occurrences = {}
+        for (page_name, variable), value in zip(variables, first_values):
+            distinct_values.setdefault(variable, {})[value] = True
+            occurrences[variable] = occurrences.get(variable, 0) + 1
+
+        for (page_name, variable), value_type in zip(variables, types):
+
+            current_value = self.result[page_name]['variables'][variable]
+            current_value_definition = {
+                'value': current_value,
+                'type': value_type,
+                'length': len(current_value[0]),
+                'required': True
+            }
+
+            # only variables seen on more pages than they have distinct values
+            if len(distinct_values[variable]) <= self.enum_max_values and len(distinct_values[variable]) < occurrences[variable]:
+                current_value_definition['enum'] = list(distinct_values[variable])
+
+            self.result[page_name]['variables'][variable] = current_value_definition
 
-            self.result[page_name] = current_page
-            
     def parse_page(self, url) -> dict:
 
         result = {
@@ -349,13 +794,18 @@ class TrackTracker:
         #     for cookie in cookies:
         #         driver.add_cookie(cookie)
 
+        # forget requests of previously parsed pages, the browser may be kept open between scans
+        del self.driver.requests
+
         self.driver.get(url)
 
         try:
             self.driver.wait_for_request(self.adobe_analytics_host, 5)
-        except:
+        except TimeoutException:
             print(f'Could not find tracking container on {url}, do you provided the correct container locations?')
-            sys.exit()
+            if self.exit_on_missing_beacon:
+                sys.exit()
+            return result
 
         # grace period to give the onsite script time to work
         time.sleep(self.grace_period)
@@ -365,15 +815,9 @@ class TrackTracker:
         for request in self.driver.requests:
             if request.response:
                 if request.host == self.adobe_analytics_host:
-                    if request.method == 'POST':
-                        str_tracking_parameters = urlparse('https://dummy.dummy/dummy/?' + request.body.decode('utf-8'))
-                    else:
-                        str_tracking_parameters = urlparse(request.url)
-
-                    dict_str_tracking_parameters = parse_qs(str_tracking_parameters.query, keep_blank_values=True)  
                     result['request_url'] = request.url
 
-                    result['variables'] = dict_str_tracking_parameters
+                    result['variables'] = parse_tracking_parameters(request.url, request.method, request.body.decode('utf-8'))
 
         # TODO: keep digital data for debuging purposes
         # digitalData = self.driver.execute_script("return digitalData;")
@@ -419,8 +863,8 @@ if __name__ == '__main__':
     args_parser.add_argument('--env', dest='env', required=True, type=str, 
                         help='JSON key that points to the section in the settings files that contains the setup for the current process')
 
-    args_parser.add_argument('--mode', dest='mode', required=False, type=str, default='test', choices=['test', 'init', 'analyse'], 
-                        help='init: initially read the original state, test: compare original state and current state, analyse: analyse test status and create a report')
+    args_parser.add_argument('--mode', dest='mode', required=False, type=str, default='test', choices=['test', 'init', 'analyse', 'monitor', 'import'], 
+                        help='init: initially read the original state, test: compare original state and current state, analyse: analyse test status and create a report, monitor: continuously rescan pages and report verdict changes, import: compare original state and beacons from a HAR file or beacon log')
 
     args_parser.add_argument('--original', dest='original', required=True, type=str,
                         help='filename that contains original tracked variables in JSON format')
@@ -434,8 +878,17 @@ if __name__ == '__main__':
     args_parser.add_argument('--focus', dest='focus', required=False, 
                         help='set to a unique page name from your settings section to only scan this particular page, this will disable all file outputs to prevent unwanted loss of previous data')
 
+    args_parser.add_argument('--beacons', dest='beacons', required=False, type=str,
+                        help='HAR file or beacon log to read the current tracked variables from in import mode, no browser will be opened')
+
+    args_parser.add_argument('--network', dest='network', required=False, type=str, default='live', choices=['live', 'record', 'replay'],
+                        help='live: load pages from the web, record: also store the responses in the archive, replay: serve the responses from the archive, only the tag container and the analytics requests go to the web')
+
     args = args_parser.parse_args()
 
+    if args.mode == 'import' and args.beacons is None:
+        args_parser.error('--beacons is required in import mode')
+
     # TODO: make "env" configurable 
     # run script like this: ./run.py -a=original_status -b=current_status
     # run script initially like this ./run.py -a=original_status
@@ -448,5 +901,7 @@ if __name__ == '__main__':
         original = args.original,
         test = args.test,
         silent = args.silent,
-        focus = args.focus
+        focus = args.focus,
+        beacons = args.beacons,
+        network = args.network
     )
\ No newline at end of file